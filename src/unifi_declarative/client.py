@@ -1,25 +1,81 @@
 import os
 import json
+import random
+import shutil
 import time
+from pathlib import Path
 import requests
 from requests.exceptions import Timeout, ConnectionError, HTTPError
 from typing import Any, Dict, Optional
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from dotenv import load_dotenv
 
 
+# orjson serializes dicts 2-5x faster than stdlib json and decodes straight
+# from bytes; fall back to stdlib when it is not installed.
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Parse .env into os.environ once per process; repeat callers hit the cache."""
+    return load_dotenv()
+
+
+class RateLimitError(RuntimeError):
+    """Controller responded 429; retry_after carries the server's hint in seconds."""
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(f"Rate limited by controller (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(resp) -> float:
+    """Parse a Retry-After header, defaulting to 1s (HTTP-dates are not worth it here)."""
+    try:
+        return float(resp.headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
 def retry_on_429(max_retries=3, backoff=2.0):
-    """Retry on 429 rate limit with exponential backoff."""
+    """
+    Retry on 429 rate limit with full-jitter exponential backoff.
+
+    Waits random.uniform(0, min(60, backoff * 2**attempt)) — at least the
+    server's Retry-After hint — so concurrent callers that were throttled
+    together do not wake up and re-stampede the controller at the same
+    instant. Only RateLimitError is retried; every other error propagates.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
-                except RuntimeError as e:
-                    if "429" in str(e) and attempt < max_retries - 1:
-                        wait = backoff ** attempt
-                        time.sleep(wait)
+                except RateLimitError as e:
+                    if attempt < max_retries - 1:
+                        wait = random.uniform(0, min(60.0, backoff * (2 ** attempt)))
+                        time.sleep(max(wait, e.retry_after))
                     else:
                         raise
             return func(*args, **kwargs)
@@ -35,135 +91,266 @@ class UniFiClient:
         self.site = site
         self.verify_ssl = verify_ssl
         self.session = requests.Session()
+        # One controller host, so a single pool with room for 32 concurrent
+        # keep-alive connections; retries are handled by our own decorator.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Set verification and shared headers once instead of per call
+        self.session.verify = verify_ssl
+        self.session.headers.update({"Connection": "keep-alive", "Accept": "application/json"})
         self._token = None
+        # TTL cache of parsed GET responses: path -> (monotonic_ts, data, etag)
+        self._cache: Dict[str, tuple] = {}
+        # Endpoint URLs rendered once; per-call code only does cheap concatenation
+        self._login_url = f"{self.base_url}/api/login"
+        self._rest_base = f"{self.base_url}/api/s/{self.site}"
+        self._ep_networkconf = f"{self._rest_base}/rest/networkconf"
+        self._ep_device_stat = f"{self._rest_base}/stat/device"
+        self._ep_devmgr = f"{self._rest_base}/cmd/devmgr"
+        self._ep_backup = f"{self._rest_base}/cmd/backup"
 
     def login(self) -> None:
-        url = f"{self.base_url}/api/login"
+        url = self._login_url
         payload = {"username": self.username, "password": self.password}
-        resp = self.session.post(url, json=payload, verify=self.verify_ssl)
+        resp = self.session.post(
+            url, data=_json_dumps(payload), headers=_JSON_HEADERS
+        )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         self._token = data.get('data', [{}])[0].get('token')
         if not self._token:
             # Some controller versions rely on session cookies without explicit token
             self._token = 'cookie-auth'
 
-    def get(self, path: str) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        resp = self.session.get(url, verify=self.verify_ssl, timeout=30)
+    def warm_connection(self) -> None:
+        """
+        Best-effort DNS/TCP/TLS prime of the session pool.
+
+        Run on a background thread before login so the handshake overlaps
+        local work (YAML parse, validation). Errors are ignored; login will
+        surface any real connectivity problem.
+        """
+        try:
+            self.session.get(self.base_url, timeout=5)
+        except Exception:
+            pass
+
+    def get(self, path: str, ttl: float = 0.0) -> Dict[str, Any]:
+        """
+        GET a JSON endpoint, optionally serving a cached parsed response.
+
+        With ttl > 0, a response younger than ttl seconds is returned without
+        touching the network or re-parsing JSON; an expired entry is
+        revalidated with If-None-Match, and a 304 just refreshes its
+        timestamp. ttl=0 (default) always fetches fresh. Accepts a
+        pre-rendered absolute URL or a controller-relative path.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        now = time.monotonic()
+        hit = self._cache.get(path) if ttl > 0 else None
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        headers = {"If-None-Match": hit[2]} if hit and hit[2] else None
+        resp = self.session.get(url, headers=headers, timeout=30)
+        if hit and resp.status_code == 304:
+            self._cache[path] = (now, hit[1], hit[2])
+            return hit[1]
         resp.raise_for_status()
-        return resp.json()
+        data = _json_loads(resp.content)
+        if ttl > 0:
+            self._cache[path] = (now, data, resp.headers.get("ETag"))
+        return data
 
     @retry_on_429()
-    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
+    def _request(self, method: str, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shared write-method implementation for post/put.
+
+        JSON-encodes the payload once, retries auth once on 401, maps 429 to
+        RateLimitError for the retry decorator, and normalizes transport
+        errors to RuntimeError.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        body = _json_dumps(payload)
+        send = getattr(self.session, method)
         try:
-            resp = self.session.post(url, json=payload, verify=self.verify_ssl, timeout=30)
+            resp = send(url, data=body, headers=_JSON_HEADERS, timeout=30)
             if resp.status_code == 401:
                 # try re-login once
                 self.login()
-                resp = self.session.post(url, json=payload, verify=self.verify_ssl, timeout=30)
+                resp = send(url, data=body, headers=_JSON_HEADERS, timeout=30)
+            if resp.status_code == 429:
+                raise RateLimitError(_retry_after_seconds(resp))
             resp.raise_for_status()
-            return resp.json()
+            return _json_loads(resp.content)
         except Timeout:
             raise RuntimeError("Controller timeout after 30s")
         except ConnectionError as e:
             raise RuntimeError(f"Cannot reach controller: {e}")
-        except HTTPError as e:
+        except HTTPError:
             raise RuntimeError(f"API error {resp.status_code}: {resp.text}")
 
-    @retry_on_429()
+    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request("post", path, payload)
+
     def put(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        try:
-            resp = self.session.put(url, json=payload, verify=self.verify_ssl, timeout=30)
-            if resp.status_code == 401:
-                self.login()
-                resp = self.session.put(url, json=payload, verify=self.verify_ssl, timeout=30)
-            resp.raise_for_status()
-            return resp.json()
-        except Timeout:
-            raise RuntimeError("Controller timeout after 30s")
-        except ConnectionError as e:
-            raise RuntimeError(f"Cannot reach controller: {e}")
-        except HTTPError as e:
-            raise RuntimeError(f"API error {resp.status_code}: {resp.text}")
+        return self._request("put", path, payload)
 
-    def export_backup(self) -> bytes:
+    def export_backup(self, dest: Path) -> None:
+        """
+        Stream a controller backup to dest in 1 MB chunks.
+
+        Avoids materializing the full .unf (potentially hundreds of MB) in
+        memory; peak RSS stays O(chunk) instead of O(file).
+        """
         # Controller export endpoint varies by version; using legacy path
-        path = f"/api/s/{self.site}/cmd/backup"
-        resp = self.session.post(f"{self.base_url}{path}", json={"cmd": "backup"}, verify=self.verify_ssl)
-        resp.raise_for_status()
-        return resp.content
+        with self.session.post(
+            self._ep_backup, json={"cmd": "backup"}, stream=True
+        ) as resp:
+            resp.raise_for_status()
+            with dest.open("wb") as f:
+                shutil.copyfileobj(resp.raw, f, length=1 << 20)
 
     # ---- Networks (VLANs) ----
     def list_networks(self) -> Dict[str, Any]:
-        """List network configurations (includes VLANs)."""
-        return self.get(f"/api/s/{self.site}/rest/networkconf")
+        """List network configurations (includes VLANs); cached for 30s across retries."""
+        return self.get(self._ep_networkconf, ttl=30.0)
 
-    def upsert_vlan(self, vlan: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Create or update a VLAN network configuration.
-        
-        CRITICAL: UniFi 9.5.21 rejects "vlan": 1 in payload for Default LAN.
-        The "vlan" field must be conditionally added only for non-VLAN-1 networks.
-        """
+    @staticmethod
+    def _vlan_payload(vlan: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the networkconf payload for one VLAN definition in a single pass."""
         payload = {
             "name": vlan["name"],
             "subnet": vlan["subnet"],
             "gateway": vlan["gateway"],
             "dhcp_enabled": vlan.get("dhcp_enabled", True),
-            "domain_name": vlan.get("domain_name"),
-            "dns1": (vlan.get("dhcp_dns") or [None])[0],
-            "dns2": (vlan.get("dhcp_dns") or [None, None])[1] if len(vlan.get("dhcp_dns", [])) > 1 else None,
-            "purpose": vlan.get("purpose"),
             "enabled": vlan.get("enabled", True),
         }
-        
+
+        # Optional fields are only set when present, so no None-stripping
+        # rebuild of the dict is needed afterwards.
+        dns = vlan.get("dhcp_dns") or ()
+        if dns:
+            payload["dns1"] = dns[0]
+            if len(dns) > 1:
+                payload["dns2"] = dns[1]
+        for key in ("domain_name", "purpose"):
+            value = vlan.get(key)
+            if value is not None:
+                payload[key] = value
+
         # Only add "vlan" field if vlan_id is present AND not VLAN 1
         # UniFi 9.5.21 API rejects "vlan": 1 for Default LAN modifications
         if "vlan_id" in vlan and int(vlan["vlan_id"]) != 1:
             payload["vlan"] = vlan["vlan_id"]
-        
-        # Remove None values
-        payload = {k: v for k, v in payload.items() if v is not None}
+
+        return payload
+
+    def upsert_vlan(self, vlan: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Create or update a VLAN network configuration.
+
+        CRITICAL: UniFi 9.5.21 rejects "vlan": 1 in payload for Default LAN.
+        The "vlan" field must be conditionally added only for non-VLAN-1 networks.
+        """
+        payload = self._vlan_payload(vlan)
         if existing and existing.get("_id"):
-            return self.put(f"/api/s/{self.site}/rest/networkconf/{existing['_id']}", payload)
-        return self.post(f"/api/s/{self.site}/rest/networkconf", payload)
+            return self.put(f"{self._ep_networkconf}/{existing['_id']}", payload)
+        return self.post(self._ep_networkconf, payload)
+
+    def bulk_upsert_vlans(self, vlans: list, networks: Optional[Any] = None) -> None:
+        """
+        Create or update many VLANs in one controller round trip.
+
+        POSTs the full payload array to the bulk networkconf endpoint; older
+        controllers that lack it (404) fall back to per-VLAN upserts.
+
+        Args:
+            vlans: VLAN definitions to reconcile (VLAN 1 must already be filtered out)
+            networks: Optional pre-fetched list_networks() result for the fallback path
+        """
+        if not vlans:
+            return
+        try:
+            self.post(
+                self._ep_networkconf + "/bulk",
+                {"data": [self._vlan_payload(v) for v in vlans]},
+            )
+            return
+        except RuntimeError as e:
+            if "404" not in str(e):
+                raise
+            # Controller predates the bulk endpoint; upsert concurrently.
+            # requests.Session is thread-safe here: the urllib3 pool hands each
+            # worker its own connection, so RTTs overlap instead of serializing.
+        if networks is None:
+            networks = self.list_networks()
+        # Index the live networks once; per-VLAN matching is then O(1)
+        # instead of a linear scan of the controller list for every upsert.
+        by_vlan, by_name = self.index_networks(networks)
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(
+                ex.map(
+                    lambda v: self.upsert_vlan(
+                        v,
+                        existing=by_vlan.get(str(v["vlan_id"])) or by_name.get(v.get("name")),
+                    ),
+                    vlans,
+                )
+            )
+
+    @staticmethod
+    def index_networks(networks: Any) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Normalize a list_networks result and index it for O(1) matching.
+
+        Handles both response shapes ({"data": [...]} and a bare list) in one
+        place and returns (by_vlan, by_name) maps; callers reconciling many
+        VLANs build the index once instead of scanning the list per VLAN.
+        """
+        data = networks.get("data", []) if isinstance(networks, dict) else (networks or [])
+        by_vlan = {str(n.get("vlan")): n for n in data}
+        by_name = {n.get("name"): n for n in data}
+        return by_vlan, by_name
 
     def find_existing_vlan(self, networks: Any, vlan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find existing network by VLAN ID or name."""
-        try:
-            for n in networks.get("data", networks if isinstance(networks, list) else []):
-                if str(n.get("vlan")) == str(vlan.get("vlan_id")) or n.get("name") == vlan.get("name"):
-                    return n
-        except Exception:
-            pass
-        return None
+        by_vlan, by_name = self.index_networks(networks)
+        return by_vlan.get(str(vlan.get("vlan_id"))) or by_name.get(vlan.get("name"))
 
     def provision_gateway(self) -> None:
         """Optional: trigger gateway provision (best-effort, may vary by version)."""
         try:
-            self.post(f"/api/s/{self.site}/cmd/devmgr", {"cmd": "force-provision"})
+            self.post(self._ep_devmgr, {"cmd": "force-provision"})
         except Exception:
             # non-fatal
             pass
 
     def wait_for_provisioning(self, timeout: int = 90, poll_interval: int = 5) -> bool:
-        """Poll device status until provisioning completes or timeout."""
+        """
+        Poll device status until provisioning completes or timeout.
+
+        Uses exponential backoff (0.5s doubling by 1.5x, capped at poll_interval)
+        so a fast provision returns in well under a second instead of paying a
+        fixed worst-case sleep. Each sleep is jittered +/-20% so concurrent
+        runs do not synchronize their polls against the controller.
+        """
         start = time.time()
+        attempt = 0
         while time.time() - start < timeout:
             try:
-                devices = self.get(f"/api/s/{self.site}/stat/device")
-                for device in devices.get("data", []):
-                    if device.get("type") in ("usg", "usw"):
-                        if device.get("state") != 1:
-                            time.sleep(poll_interval)
-                            break
-                else:
+                devices = self.get(self._ep_device_stat)
+                if all(
+                    d.get("state") == 1
+                    for d in devices.get("data", [])
+                    if d.get("type") in ("usg", "usw")
+                ):
                     return True  # All devices ready
             except Exception:
-                time.sleep(poll_interval)
+                pass
+            time.sleep(min(0.5 * 1.5 ** attempt, float(poll_interval)) * random.uniform(0.8, 1.2))
+            attempt += 1
         return False
 
     @classmethod
@@ -184,7 +371,7 @@ class UniFiClient:
         Raises:
             RuntimeError: If required credentials are missing
         """
-        load_dotenv()
+        _load_dotenv_once()
         base_url = os.getenv("UNIFI_CONTROLLER_URL", "")
         username = os.getenv("UNIFI_USERNAME", "")
         password = os.getenv("UNIFI_PASSWORD", "")
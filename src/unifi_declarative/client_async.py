@@ -0,0 +1,145 @@
+"""
+Async UniFi controller client built on httpx.
+
+Opt-in alternative to client.UniFiClient: all VLAN upserts are issued as
+coroutines and gathered concurrently, so N round trips cost roughly one RTT
+of wall-clock time. With http2=True the calls multiplex over a single TLS
+connection. The sync client remains the default apply path; use
+apply_vlans_concurrently (or asyncio.run over the coroutines directly) where
+bulk latency matters and httpx is installed.
+
+Requires the optional `httpx` dependency (requirements.txt).
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+from .client import _json_dumps, _json_loads, _load_dotenv_once
+
+logger = logging.getLogger(__name__)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class AsyncUniFiClient:
+    """httpx.AsyncClient-backed mirror of UniFiClient's REST surface."""
+
+    def __init__(self, base_url: str, username: str, password: str, site: str = "default", verify_ssl: bool = True):
+        if httpx is None:
+            raise RuntimeError(
+                "AsyncUniFiClient requires the optional 'httpx' dependency "
+                "(pip install httpx[http2])"
+            )
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.site = site
+        self.verify_ssl = verify_ssl
+        self._client = httpx.AsyncClient(
+            http2=True,
+            verify=verify_ssl,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            headers={"Accept": "application/json"},
+            timeout=30.0,
+        )
+
+    async def login(self) -> None:
+        url = f"{self.base_url}/api/login"
+        payload = {"username": self.username, "password": self.password}
+        resp = await self._client.post(url, content=_json_dumps(payload), headers=_JSON_HEADERS)
+        resp.raise_for_status()
+
+    async def get(self, path: str) -> Dict[str, Any]:
+        resp = await self._client.get(f"{self.base_url}{path}")
+        resp.raise_for_status()
+        return _json_loads(resp.content)
+
+    async def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        resp = await self._client.post(
+            f"{self.base_url}{path}", content=_json_dumps(payload), headers=_JSON_HEADERS
+        )
+        if resp.status_code == 401:
+            await self.login()
+            resp = await self._client.post(
+                f"{self.base_url}{path}", content=_json_dumps(payload), headers=_JSON_HEADERS
+            )
+        resp.raise_for_status()
+        return _json_loads(resp.content)
+
+    async def put(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        resp = await self._client.put(
+            f"{self.base_url}{path}", content=_json_dumps(payload), headers=_JSON_HEADERS
+        )
+        if resp.status_code == 401:
+            await self.login()
+            resp = await self._client.put(
+                f"{self.base_url}{path}", content=_json_dumps(payload), headers=_JSON_HEADERS
+            )
+        resp.raise_for_status()
+        return _json_loads(resp.content)
+
+    async def list_networks(self) -> Dict[str, Any]:
+        """List network configurations (includes VLANs)."""
+        return await self.get(f"/api/s/{self.site}/rest/networkconf")
+
+    async def upsert_vlan(self, vlan: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create or update a VLAN network configuration (see UniFiClient.upsert_vlan)."""
+        from .client import UniFiClient
+
+        payload = UniFiClient._vlan_payload(vlan)  # same payload rules as the sync client
+        if existing and existing.get("_id"):
+            return await self.put(f"/api/s/{self.site}/rest/networkconf/{existing['_id']}", payload)
+        return await self.post(f"/api/s/{self.site}/rest/networkconf", payload)
+
+    async def upsert_vlans(self, vlans: List[Dict[str, Any]]) -> None:
+        """Upsert all VLANs concurrently over the multiplexed connection."""
+        networks = await self.list_networks()
+        data = networks.get("data", []) if isinstance(networks, dict) else networks
+        live_by_vlan = {int(n.get("vlan") or 0): n for n in data}
+        await asyncio.gather(
+            *[self.upsert_vlan(v, existing=live_by_vlan.get(int(v["vlan_id"]))) for v in vlans]
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @classmethod
+    def from_env(cls) -> "AsyncUniFiClient":
+        """Build from the same environment variables as UniFiClient.from_env."""
+        _load_dotenv_once()
+        base_url = os.getenv("UNIFI_CONTROLLER_URL", "")
+        username = os.getenv("UNIFI_USERNAME", "")
+        password = os.getenv("UNIFI_PASSWORD", "")
+        if not all([base_url, username, password]):
+            raise RuntimeError(
+                "Missing required environment variables. "
+                "Ensure .env has UNIFI_CONTROLLER_URL, UNIFI_USERNAME, and UNIFI_PASSWORD"
+            )
+        return cls(
+            base_url=base_url,
+            username=username,
+            password=password,
+            site=os.getenv("UNIFI_SITE", "default"),
+            verify_ssl=os.getenv("UNIFI_VERIFY_SSL", "true").lower() == "true",
+        )
+
+
+def apply_vlans_concurrently(vlans: List[Dict[str, Any]]) -> None:
+    """Sync entry point: login, gather all upserts, and close the client."""
+
+    async def _run() -> None:
+        client = AsyncUniFiClient.from_env()
+        try:
+            await client.login()
+            await client.upsert_vlans(vlans)
+        finally:
+            await client.aclose()
+
+    asyncio.run(_run())
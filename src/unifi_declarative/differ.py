@@ -1,8 +1,60 @@
 from typing import Any, Dict
-from deepdiff import DeepDiff
 
+# The fields that actually matter for reconciliation; everything else on a
+# controller network object is noise for our purposes.
+COMPARED_KEYS = (
+    "name",
+    "vlan_id",
+    "subnet",
+    "gateway",
+    "dhcp_enabled",
+    "dhcp_start",
+    "dhcp_stop",
+    "dhcp_dns",
+    "dhcp_options",
+    "purpose",
+    "enabled",
+)
 
-def diff_configs(desired: Dict[str, Any], live: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a concise diff between desired and live controller objects."""
-    dd = DeepDiff(live, desired, ignore_order=True)
-    return dd.to_dict() if hasattr(dd, 'to_dict') else dict(dd)
+
+def _diff_vlan(live: Dict[str, Any], desired: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare one VLAN over COMPARED_KEYS, returning {field: {old, new}}."""
+    changes: Dict[str, Any] = {}
+    for key in COMPARED_KEYS:
+        old, new = live.get(key), desired.get(key)
+        if key == "dhcp_options" and old and new:
+            # Option order is irrelevant; normalize before comparing
+            old = sorted((o.get("option"), o.get("value")) for o in old)
+            new = sorted((o.get("option"), o.get("value")) for o in new)
+        if old != new:
+            changes[key] = {"old": live.get(key), "new": desired.get(key)}
+    return changes
+
+
+def diff_configs(desired: Dict[str, Any], live: Dict[str, Any], full: bool = False) -> Dict[str, Any]:
+    """
+    Return a concise diff between desired and live controller objects.
+
+    The default path hand-compares only the known VLAN fields — an order of
+    magnitude fewer Python-level operations than a generic structural diff.
+    Pass full=True to fall back to DeepDiff over the raw dicts for debugging.
+    """
+    if full:
+        from deepdiff import DeepDiff
+
+        dd = DeepDiff(live, desired, ignore_order=True)
+        return dd.to_dict() if hasattr(dd, 'to_dict') else dict(dd)
+
+    desired_vlans = desired.get("vlans", {})
+    live_vlans = live.get("vlans", {})
+
+    result: Dict[str, Any] = {"added": [], "removed": [], "changed": {}}
+    for key, vlan in desired_vlans.items():
+        if key not in live_vlans:
+            result["added"].append(key)
+        else:
+            changes = _diff_vlan(live_vlans[key], vlan)
+            if changes:
+                result["changed"][key] = changes
+    result["removed"] = [k for k in live_vlans if k not in desired_vlans]
+    return result
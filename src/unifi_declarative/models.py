@@ -1,6 +1,6 @@
 from typing import List, Optional, Literal, Dict
-from pydantic import BaseModel, Field, IPvAnyNetwork, field_validator
-from ipaddress import IPv4Network
+from pydantic import BaseModel, Field, IPvAnyNetwork, TypeAdapter, field_validator
+from ipaddress import IPv4Address, IPv4Network
 
 
 class DHCPOption(BaseModel):
@@ -31,7 +31,9 @@ class VLANConfig(BaseModel):
     @field_validator('gateway')
     def gateway_in_subnet(cls, v, info):
         subnet = info.data.get('subnet')
-        if subnet and IPv4Network(f"{v}/32") not in subnet:
+        # Address-in-network is a single masked integer compare; no /32
+        # string formatting or network re-parse per VLAN
+        if subnet and IPv4Address(v) not in subnet:
             raise ValueError(f"Gateway {v} not in {subnet}")
         return v
 
@@ -39,3 +41,11 @@ class VLANConfig(BaseModel):
 class NetworkConfig(BaseModel):
     vlans: Dict[str, VLANConfig]
     # Removed hardcoded 4-VLAN limit; hardware limits enforced in validators.py
+
+
+# Compiled once at import: repeated validation (watch mode, reconcile loops)
+# should call VLAN_ADAPTER.validate_python(vlan) rather than constructing
+# VLANConfig(**vlan), which re-dispatches model setup per call. For configs
+# already validated on a previous read (unchanged mtime via the YAML cache),
+# VLANConfig.model_construct skips validation entirely.
+VLAN_ADAPTER = TypeAdapter(VLANConfig)
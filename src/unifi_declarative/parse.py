@@ -0,0 +1,169 @@
+"""
+Pre-parsed configuration structures for unifi-declarative-network.
+
+The dict-accepting validators re-read nested keys and re-parse IP strings
+on every call. parse_vlans/parse_hardware convert a raw config once into
+slotted, frozen dataclasses with ipaddress objects attached; the
+parsed-object validators below then run on attribute access and integer
+compares only. The dict-accepting functions in validators.py remain the
+back-compat path for callers holding raw YAML.
+"""
+
+from dataclasses import dataclass
+from ipaddress import IPv4Address, IPv4Network
+from typing import Any, Optional
+
+from .validators import (
+    ValidationError,
+    _addr,
+    _net,
+    _schema_errors,
+    load_hardware_profile,
+    validate_uplink_trunk_config,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class VLAN:
+    """One VLAN block with IP fields parsed up front."""
+
+    vlan_id: int
+    name: str
+    subnet: IPv4Network
+    gateway: IPv4Address
+    dhcp_enabled: bool
+    enabled: bool
+    dhcp_start: Optional[IPv4Address] = None
+    dhcp_stop: Optional[IPv4Address] = None
+
+
+@dataclass(slots=True, frozen=True)
+class HardwareProfile:
+    """hardware.yaml normalized once, with switches indexed by model."""
+
+    gateway: dict[str, Any]
+    switches: tuple[dict[str, Any], ...]
+    switches_by_model: dict[str, dict[str, Any]]
+    controller: dict[str, Any]
+
+
+def parse_vlans(raw: dict[str, dict[str, Any]]) -> dict[int, VLAN]:
+    """
+    Parse raw vlans.yaml blocks into VLAN records keyed by integer VLAN ID.
+
+    Schema validation runs first (aggregated, one error line per violation),
+    so a returned mapping is guaranteed well-formed and every IP field is
+    parsed exactly once.
+
+    Raises:
+        ValidationError: If any VLAN block fails schema validation
+    """
+    errors = [
+        f"VLAN {key}: {err}"
+        for key, cfg in raw.items()
+        for err in _schema_errors(cfg)
+    ]
+    if errors:
+        raise ValidationError("\n".join(errors))
+
+    parsed: dict[int, VLAN] = {}
+    for key, cfg in raw.items():
+        dhcp_start = cfg.get("dhcp_start")
+        dhcp_stop = cfg.get("dhcp_stop")
+        parsed[int(key)] = VLAN(
+            vlan_id=cfg["vlan_id"],
+            name=cfg["name"],
+            subnet=_net(str(cfg["subnet"])),
+            gateway=_addr(str(cfg["gateway"])),
+            dhcp_enabled=bool(cfg["dhcp_enabled"]),
+            enabled=bool(cfg["enabled"]),
+            dhcp_start=_addr(str(dhcp_start)) if dhcp_start else None,
+            dhcp_stop=_addr(str(dhcp_stop)) if dhcp_stop else None,
+        )
+    return parsed
+
+
+def parse_hardware(raw: dict[str, Any]) -> HardwareProfile:
+    """
+    Normalize raw hardware.yaml into a HardwareProfile record.
+
+    Raises:
+        ValidationError: If two switches share a model (index would shadow)
+    """
+    hw = load_hardware_profile(raw)
+    return HardwareProfile(
+        gateway=hw["gateway"],
+        switches=tuple(hw["switches"]),
+        switches_by_model=hw["switches_by_model"],
+        controller=hw["controller"],
+    )
+
+
+def validate_subnet_overlap_parsed(vlans: dict[int, VLAN]) -> None:
+    """
+    Sort-and-sweep overlap check over already-parsed subnets.
+
+    Same algorithm as validators.validate_subnet_overlap but with zero
+    string parsing: the intervals come straight off VLAN.subnet.
+
+    Raises:
+        ValidationError: If any two subnets overlap
+    """
+    intervals = sorted(
+        (int(v.subnet.network_address), int(v.subnet.broadcast_address), vid)
+        for vid, v in vlans.items()
+    )
+    for (s, _e, vid), (_ps, pe, pvid) in zip(intervals[1:], intervals):
+        if s <= pe:
+            raise ValidationError(f"VLAN {pvid} subnet overlaps VLAN {vid}")
+
+
+def validate_uplink_trunk_config_parsed(
+    hardware: HardwareProfile, vlans: dict[int, VLAN]
+) -> None:
+    """
+    Trunk check against parsed records; the integer VLAN IDs are the keys,
+    so no per-call string-to-int conversion remains.
+
+    Raises:
+        ValidationError: If uplink is not a trunk, native VLAN != 1, or tags mismatch
+    """
+    validate_uplink_trunk_config(
+        {"switches": list(hardware.switches)}, {}, vlan_ids=list(vlans)
+    )
+
+
+def validate_controller_ip_migration_parsed(
+    hardware: HardwareProfile, vlans: dict[int, VLAN]
+) -> None:
+    """
+    Controller migration check on parsed records: VLAN 10's subnet bounds and
+    gateway are already ipaddress objects, so only the target IP is parsed
+    (through the shared cache).
+
+    Raises:
+        ValidationError: If target IP == current IP, target IP outside VLAN 10,
+            or gateway misconfigured
+    """
+    controller = hardware.controller
+    current_ip = controller.get("current_ip")
+    target_ip = controller.get("target_ip")
+
+    if not (current_ip and target_ip):
+        raise ValidationError("Controller current_ip/target_ip must be specified in hardware.yaml")
+
+    if current_ip == target_ip:
+        raise ValidationError("Controller target_ip must differ from current_ip for migration")
+
+    vlan10 = vlans.get(10)
+    if not vlan10:
+        raise ValidationError("VLAN 10 not found in vlans.yaml for controller placement")
+
+    lo, hi = int(vlan10.subnet.network_address), int(vlan10.subnet.broadcast_address)
+    if not (lo <= int(_addr(str(target_ip))) <= hi):
+        raise ValidationError(
+            f"Controller target_ip {target_ip} must be within VLAN 10 subnet {vlan10.subnet}"
+        )
+
+    if not (lo <= int(vlan10.gateway) <= hi):
+        raise ValidationError("VLAN 10 gateway must reside within VLAN 10 subnet")
@@ -9,6 +9,13 @@ import logging
 from pathlib import Path
 import os
 import yaml
+
+# libyaml-backed C loader when available (see apply.py for rationale)
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 from dotenv import load_dotenv
 
 from .validators import (
@@ -22,6 +29,11 @@ from .logging_config import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Resolved once at import; resolve() stats every path component.
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_VLANS_PATH = _REPO_ROOT / "config" / "vlans.yaml"
+_HARDWARE_PATH = _REPO_ROOT / "config" / "hardware.yaml"
+
 
 def main() -> int:
     """
@@ -32,35 +44,37 @@ def main() -> int:
     """
     setup_logging()
     load_dotenv()
-    hardware = os.getenv("HARDWARE_PROFILE", "usg3p")
+    hardware_profile = os.getenv("HARDWARE_PROFILE", "usg3p")
 
-    repo_root = Path(__file__).resolve().parents[2]
-    vlans_path = repo_root / "config" / "vlans.yaml"
-    hardware_path = repo_root / "config" / "hardware.yaml"
+    vlans_path = _VLANS_PATH
+    hardware_path = _HARDWARE_PATH
 
     if not vlans_path.exists():
         logger.error("VLAN config not found at %s", vlans_path)
         return 1
 
     try:
-        with vlans_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        # Single-syscall byte read; the C loader decodes UTF-8 itself rather
+        # than going through Python's text layer first.
+        data = yaml.load(vlans_path.read_bytes(), Loader=_Loader) or {}
         vlans = data.get("vlans", {})
 
         if not hardware_path.exists():
             raise ValidationError("Missing config/hardware.yaml — required for topology checks")
-        with hardware_path.open("r", encoding="utf-8") as hf:
-            hardware = yaml.safe_load(hf) or {}
+        hardware = yaml.load(hardware_path.read_bytes(), Loader=_Loader) or {}
 
         # Hardware limit validation
-        validate_vlan_count(vlans, hardware_profile=hardware)
+        validate_vlan_count(vlans, hardware_profile=hardware_profile)
 
-        # Per-VLAN schema validation
+        # Per-VLAN schema validation fused with VLAN-ID collection: one pass
+        # over the config instead of separate schema and int-conversion walks
+        vlan_ids = []
         for key, vlan in vlans.items():
             validate_vlan_schema(vlan)
+            vlan_ids.append(int(key))
 
         # Topology validations using hardware.yaml
-        validate_uplink_trunk_config(hardware, vlans)
+        validate_uplink_trunk_config(hardware, vlans, vlan_ids=vlan_ids)
         validate_controller_ip_migration(hardware, vlans)
 
         logger.info(
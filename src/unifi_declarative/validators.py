@@ -5,19 +5,66 @@ Enforces schema correctness, hardware constraints, and idempotency guarantees
 before any API calls reach the UniFi controller.
 """
 
+import functools
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Iterable, Optional
 from ipaddress import ip_network, ip_address, AddressValueError
 
 logger = logging.getLogger(__name__)
 
+def _has_tbd(o: Any) -> bool:
+    """Recursively check a config value for TBD placeholders.
+
+    Walks strings, dicts, and lists directly with early exit, rather than
+    serializing the whole blob to one big string first.
+    """
+    if isinstance(o, str):
+        return "TBD" in o
+    if isinstance(o, dict):
+        return any(_has_tbd(v) for v in o.values())
+    if isinstance(o, (list, tuple)):
+        return any(_has_tbd(v) for v in o)
+    return False
+
+
+@functools.lru_cache(maxsize=512)
+def _net(s: str):
+    """Parse a subnet string once per process; repeat validations hit the cache."""
+    return ip_network(s, strict=False)
+
+
+@functools.lru_cache(maxsize=512)
+def _addr(s: str):
+    """Parse an address string once per process; repeat validations hit the cache."""
+    return ip_address(s)
+
+# Schema constants built once at import; per-VLAN validation does only the checks.
+_REQUIRED_VLAN_FIELDS = frozenset({
+    "name", "subnet", "gateway", "vlan_id",
+    "dhcp_enabled", "enabled",
+})
+
+# Hardware-specific VLAN limits, keyed by lowercased profile name. Frozen so a
+# validator can't mutate it by accident; built once rather than per call.
+_REQUIRED_UPLINK_FIELDS = frozenset({"type", "native_vlan", "tagged_vlans"})
+
+_VLAN_LIMITS = MappingProxyType({
+    "usg3p": 8,      # UniFi Security Gateway 3P (EdgeOS-based)
+    "uxg-pro": 32,   # Next-gen gateway (full Linux network stack)
+    "udm-se": 32,    # Dream Machine Special Edition
+    "udm-pro": 32,   # Dream Machine Pro
+})
+_SUPPORTED_PROFILES_STR = ", ".join(_VLAN_LIMITS)
+
 
 class ValidationError(Exception):
     """Raised when configuration validation fails."""
     pass
 
 
-def validate_vlan_count(vlans: dict[str, Any], hardware_profile: str) -> None:
+def validate_vlan_count(vlans: dict[str, dict[str, Any]], hardware_profile: str) -> None:
     """
     Enforce hardware-specific VLAN limits.
     
@@ -46,24 +93,17 @@ def validate_vlan_count(vlans: dict[str, Any], hardware_profile: str) -> None:
             "See docs/9.5.21-NOTES.md for details."
         )
     
-    vlan_count = len(vlans)
-    
-    # Hardware-specific limits
-    limits = {
-        "usg3p": 8,      # UniFi Security Gateway 3P (EdgeOS-based)
-        "uxg-pro": 32,   # Next-gen gateway (full Linux network stack)
-        "udm-se": 32,    # Dream Machine Special Edition
-        "udm-pro": 32,   # Dream Machine Pro
-    }
-    
-    max_vlans = limits.get(hardware_profile.lower())
-    
+    # Checks ordered cheap-to-expensive: key membership above, then the
+    # profile lookup, and only then the count comparison.
+    max_vlans = _VLAN_LIMITS.get(hardware_profile.lower())
+
     if max_vlans is None:
         raise ValidationError(
             f"Unknown hardware profile: '{hardware_profile}'. "
-            f"Supported: {', '.join(limits.keys())}"
+            f"Supported: {_SUPPORTED_PROFILES_STR}"
         )
-    
+
+    vlan_count = len(vlans)
     if vlan_count > max_vlans:
         raise ValidationError(
             f"{hardware_profile.upper()} supports max {max_vlans} VLANs. "
@@ -72,94 +112,141 @@ def validate_vlan_count(vlans: dict[str, Any], hardware_profile: str) -> None:
         )
 
 
-def validate_vlan_schema(vlan_config: dict[str, Any]) -> None:
+def _schema_errors(vlan_config: dict[str, Any]) -> list[str]:
     """
-    Validate VLAN configuration schema and enforce UniFi-specific constraints.
-    
-    Ensures all required fields are present, types are correct, and UniFi best practices
-    are followed (DHCP pool doesn't overlap gateway, VLAN ID within 802.1Q range).
-    
-    Args:
-        vlan_config: Single VLAN configuration block from vlans.yaml
-    
-    Raises:
-        ValidationError: If required fields are missing, types invalid, or constraints violated
-        
-    Example:
-        >>> config = {"name": "Servers", "vlan_id": 10, "subnet": "10.0.1.0/26", 
-        ...           "gateway": "10.0.1.1", "dhcp_enabled": True, "enabled": True,
-        ...           "dhcp_start": "10.0.1.10", "dhcp_stop": "10.0.1.62"}
-        >>> validate_vlan_schema(config)  # Passes validation
+    Collect schema violations for one VLAN block without raising.
+
+    Dependent checks short-circuit (missing fields or a non-int vlan_id make
+    the later checks meaningless); independent checks all run so callers can
+    report every problem in one pass.
     """
-    required_fields = [
-        "name", "subnet", "gateway", "vlan_id", 
-        "dhcp_enabled", "enabled"
-    ]
-    
-    for field in required_fields:
-        if field not in vlan_config:
-            raise ValidationError(
-                f"Missing required field '{field}' in VLAN configuration"
-            )
-    
-    # Type validation
-    if not isinstance(vlan_config["vlan_id"], int):
-        raise ValidationError(
-            f"VLAN ID must be an integer, got {type(vlan_config['vlan_id'])}"
-        )
-    
+    # One C-level set difference instead of a per-field membership loop; also
+    # reports every missing field at once.
+    missing = _REQUIRED_VLAN_FIELDS - vlan_config.keys()
+    if missing:
+        return [f"Missing required fields {sorted(missing)} in VLAN configuration"]
+
+    # Type validation; vid is read once and reused below
+    vid = vlan_config["vlan_id"]
+    if not isinstance(vid, int):
+        return [f"VLAN ID must be an integer, got {type(vid)}"]
+
+    errors: list[str] = []
+
     # VLAN 1 is FORBIDDEN in declarative config (UniFi 9.5.21 requirement)
     # VLAN 1 must be managed manually via controller UI to prevent adoption failures
-    if vlan_config["vlan_id"] == 1:
-        raise ValidationError(
+    if vid == 1:
+        errors.append(
             "VLAN 1 (Default LAN) MUST NOT be in vlans.yaml. "
             "UniFi 9.5.21 requires VLAN 1 to be changed manually in the UI BEFORE "
             "adopting devices or creating VLANs. Attempting to manage VLAN 1 via API "
             "causes 'api.err.VlanUsed' errors and breaks device adoption. "
             "See docs/9.5.21-NOTES.md for the mandatory bootstrap procedure."
         )
-    
-    # VLAN range per 802.1Q (4095 reserved)
-    if not (1 <= vlan_config["vlan_id"] <= 4094):
-        raise ValidationError(
-            f"VLAN ID must be between 1 and 4094, got {vlan_config['vlan_id']}"
-        )
-    
-    if vlan_config["vlan_id"] == 4095:
-        raise ValidationError("VLAN 4095 is reserved per 802.1Q")
-    
+    # Single range check covers 802.1Q (4095 reserved); VLAN 1 handled above
+    elif not (2 <= vid <= 4094):
+        errors.append(f"VLAN ID must be between 1 and 4094, got {vid}")
+
     # DHCP pool validation
     if vlan_config.get("dhcp_enabled"):
         subnet_str = str(vlan_config.get("subnet", ""))
         gateway = vlan_config.get("gateway")
         dhcp_start = vlan_config.get("dhcp_start")
         dhcp_stop = vlan_config.get("dhcp_stop")
-        
+
         if dhcp_start and dhcp_stop and gateway:
+            # Only the parse calls can fail; the overlap compare runs outside
+            # any exception handling so a real violation surfaces directly.
             try:
-                from ipaddress import ip_address, ip_network
-                subnet = ip_network(subnet_str, strict=False)
-                gw = ip_address(gateway)
-                start = ip_address(dhcp_start)
-                stop = ip_address(dhcp_stop)
-                
-                if int(gw) >= int(start) and int(gw) <= int(stop):
-                    raise ValidationError(
+                _net(subnet_str)
+                gw_i = int(_addr(str(gateway)))
+                start_i = int(_addr(str(dhcp_start)))
+                stop_i = int(_addr(str(dhcp_stop)))
+            except ValueError as e:
+                errors.append(f"Invalid IP/subnet in VLAN config: {e}")
+            else:
+                if start_i <= gw_i <= stop_i:
+                    errors.append(
                         f"DHCP pool {dhcp_start}-{dhcp_stop} overlaps gateway {gateway}"
                     )
-            except Exception as e:
-                if "DHCP pool" in str(e):
-                    raise
-    
+
     # IGMP snooping warning (UniFi-specific)
-    if vlan_config.get("igmp_snooping") and vlan_config["vlan_id"] in [1, 2]:
+    if vlan_config.get("igmp_snooping") and vid in (1, 2):
         import warnings
         warnings.warn(
-            f"IGMP snooping on VLAN {vlan_config['vlan_id']} may affect UniFi device discovery"
+            f"IGMP snooping on VLAN {vid} may affect UniFi device discovery"
         )
 
+    return errors
+
+
+def validate_vlan_schema(vlan_config: dict[str, Any]) -> None:
+    """
+    Validate VLAN configuration schema and enforce UniFi-specific constraints.
+
+    Ensures all required fields are present, types are correct, and UniFi best practices
+    are followed (DHCP pool doesn't overlap gateway, VLAN ID within 802.1Q range).
+
+    Args:
+        vlan_config: Single VLAN configuration block from vlans.yaml
 
-def validate_subnet_overlap(vlans: dict[str, Any]) -> None:
+    Raises:
+        ValidationError: If required fields are missing, types invalid, or constraints violated
+
+    Example:
+        >>> config = {"name": "Servers", "vlan_id": 10, "subnet": "10.0.1.0/26",
+        ...           "gateway": "10.0.1.1", "dhcp_enabled": True, "enabled": True,
+        ...           "dhcp_start": "10.0.1.10", "dhcp_stop": "10.0.1.62"}
+        >>> validate_vlan_schema(config)  # Passes validation
+    """
+    errors = _schema_errors(vlan_config)
+    if errors:
+        raise ValidationError(errors[0])
+
+
+def validate_vlans_schema(vlans: dict[str, dict[str, Any]]) -> None:
+    """
+    Validate every VLAN's schema and report all violations at once.
+
+    Unlike validate_vlan_schema, which raises on the first problem, this
+    walks the full config and raises a single ValidationError listing every
+    offending VLAN — one fix/re-run cycle instead of one per error, same
+    pattern as validate_hardware_inventory.
+
+    Args:
+        vlans: Dictionary of VLAN configurations keyed by VLAN ID
+
+    Raises:
+        ValidationError: Aggregated, one line per violation, prefixed by VLAN key
+    """
+    all_errors = [
+        f"VLAN {key}: {err}"
+        for key, cfg in vlans.items()
+        for err in _schema_errors(cfg)
+    ]
+    if all_errors:
+        raise ValidationError("\n".join(all_errors))
+
+
+def validate_vlan_schema_many(vlans: Iterable[dict[str, Any]]) -> None:
+    """
+    Validate a batch of VLAN configurations in one call.
+
+    The schema constants (required-field table, limits) are module-level
+    singletons, so the per-VLAN iteration pays only the actual checks; call
+    sites no longer need their own loop.
+
+    Args:
+        vlans: Iterable of VLAN configuration blocks (e.g. vlans.values())
+
+    Raises:
+        ValidationError: On the first VLAN that fails schema validation
+    """
+    for vlan in vlans:
+        validate_vlan_schema(vlan)
+
+
+def validate_subnet_overlap(vlans: dict[str, dict[str, Any]]) -> None:
     """
     Ensure no VLAN subnets overlap (prevents routing conflicts).
     
@@ -179,36 +266,61 @@ def validate_subnet_overlap(vlans: dict[str, Any]) -> None:
         >>> bad_vlans = {"10": {"subnet": "10.0.0.0/16"}, "30": {"subnet": "10.0.1.0/24"}}
         >>> validate_subnet_overlap(bad_vlans)  # Raises ValidationError
     """
-    # TODO: Implement IP subnet overlap detection using ipaddress.ip_network().overlaps()
-    pass
+    # Sort-and-sweep over integer (start, end) ranges: O(N log N) with one
+    # parse per subnet, instead of pairwise IPv4Network.overlaps() calls.
+    intervals = sorted(
+        (int(net.network_address), int(net.broadcast_address), vid)
+        for vid, cfg in vlans.items()
+        for net in [_net(str(cfg["subnet"]))]
+    )
+    for (s, e, vid), (ps, pe, pvid) in zip(intervals[1:], intervals):
+        if s <= pe:
+            raise ValidationError(f"VLAN {pvid} subnet overlaps VLAN {vid}")
 
 
-def load_hardware_profile(hardware: Dict[str, Any]) -> Dict[str, Any]:
+def load_hardware_profile(hardware: dict[str, Any]) -> dict[str, Any]:
     """
     Extract hardware configuration fields needed for validation.
     
     Provides normalized access to gateway, switch, and controller definitions
-    from hardware.yaml without exposing full config structure.
-    
+    from hardware.yaml without exposing full config structure. Switches are
+    additionally indexed by model so validators look them up in O(1) instead
+    of each scanning the list.
+
     Args:
         hardware: Parsed hardware.yaml configuration
-        
+
     Returns:
-        Dictionary with 'gateway', 'switches', and 'controller' keys
-        
+        Dictionary with 'gateway', 'switches', 'switches_by_model', and 'controller' keys
+
     Example:
         >>> hw_yaml = {"gateway": {...}, "switches": [...], "controller": {...}}
         >>> profile = load_hardware_profile(hw_yaml)
-        >>> profile["gateway"]["model"]  # Access gateway details
+        >>> profile["switches_by_model"]["US-8-60W"]  # O(1) switch lookup
     """
+    switches = hardware.get("switches", [])
+    by_model: dict[str, Any] = {}
+    for s in switches:
+        model = s.get("model")
+        if model in by_model:
+            raise ValidationError(
+                f"Duplicate switch model '{model}' in hardware.yaml; "
+                "the by-model index requires unique models"
+            )
+        by_model[model] = s
     return {
         "gateway": hardware.get("gateway", {}),
-        "switches": hardware.get("switches", []),
+        "switches": switches,
+        "switches_by_model": by_model,
         "controller": hardware.get("controller", {}),
     }
 
 
-def validate_uplink_trunk_config(hardware: Dict[str, Any], vlans: Dict[str, Any]) -> None:
+def validate_uplink_trunk_config(
+    hardware: dict[str, Any],
+    vlans: dict[str, dict[str, Any]],
+    vlan_ids: Optional[list[int]] = None,
+) -> None:
     """
     Validate switch uplink trunk configuration for gateway connectivity.
     
@@ -221,7 +333,9 @@ def validate_uplink_trunk_config(hardware: Dict[str, Any], vlans: Dict[str, Any]
     Args:
         hardware: Parsed hardware.yaml configuration
         vlans: Dictionary of VLAN configurations keyed by VLAN ID
-        
+        vlan_ids: Optional pre-converted VLAN IDs (callers that already walked
+            the config pass them to avoid re-parsing the keys)
+
     Raises:
         ValidationError: If uplink is not a trunk, native VLAN != 1, or tagged VLANs mismatch
         
@@ -233,8 +347,7 @@ def validate_uplink_trunk_config(hardware: Dict[str, Any], vlans: Dict[str, Any]
         >>> validate_uplink_trunk_config(hardware, vlans)  # Passes
     """
     hw = load_hardware_profile(hardware)
-    switches: List[Dict[str, Any]] = hw.get("switches", [])
-    target_switch = next((s for s in switches if s.get("model") == "US-8-60W"), None)
+    target_switch = hw["switches_by_model"].get("US-8-60W")
     if not target_switch:
         raise ValidationError("US-8-60W switch definition missing in hardware.yaml")
 
@@ -242,27 +355,39 @@ def validate_uplink_trunk_config(hardware: Dict[str, Any], vlans: Dict[str, Any]
     if uplink_port is None:
         raise ValidationError("US-8-60W uplink_port not specified in hardware.yaml")
     
-    ports: Dict[str, Any] = target_switch.get("port_assignments", {})
+    ports: dict[str, Any] = target_switch.get("port_assignments", {})
     uplink = ports.get(str(uplink_port)) or ports.get(uplink_port)
     if not uplink:
         raise ValidationError(f"Uplink port '{uplink_port}' assignment not found on US-8-60W")
 
+    missing = _REQUIRED_UPLINK_FIELDS - uplink.keys()
+    if missing:
+        raise ValidationError(
+            f"Uplink port '{uplink_port}' missing required fields {sorted(missing)}"
+        )
+
     if uplink.get("type") != "trunk":
         raise ValidationError("US-8-60W uplink must be 'trunk'")
 
     if uplink.get("native_vlan") != 1:
         raise ValidationError("Native VLAN on uplink trunk must be 1 for management/adoption")
 
-    # Expected tagged VLANs from config
-    required_tags = sorted([int(v) for v in vlans.keys() if int(v) != 1])
-    actual_tags = sorted(list(uplink.get("tagged_vlans", [])))
-    if actual_tags != required_tags:
+    # Expected tagged VLANs from config. Hash-set equality is O(N) with no
+    # sorting; the sorted views are built only to format the error message.
+    if vlan_ids is None:
+        # Convert each key exactly once, filtering in the same pass
+        required = frozenset(i for v in vlans if (i := int(v)) != 1)
+    else:
+        required = frozenset(i for i in vlan_ids if i != 1)
+    actual = frozenset(uplink.get("tagged_vlans", ()))
+    if required != actual:
         raise ValidationError(
-            f"Uplink trunk tagged VLANs mismatch. Expected {required_tags}, found {actual_tags}"
+            f"Uplink trunk tagged VLANs mismatch. "
+            f"Missing {sorted(required - actual)}, extra {sorted(actual - required)}"
         )
 
 
-def validate_controller_ip_migration(hardware: Dict[str, Any], vlans: Dict[str, Any]) -> None:
+def validate_controller_ip_migration(hardware: dict[str, Any], vlans: dict[str, dict[str, Any]]) -> None:
     """
     Validate controller IP migration parameters for safe network transition.
     
@@ -300,8 +425,11 @@ def validate_controller_ip_migration(hardware: Dict[str, Any], vlans: Dict[str,
     if not vlan10:
         raise ValidationError("VLAN 10 not found in vlans.yaml for controller placement")
 
-    subnet10 = ip_network(vlan10["subnet"])  # e.g., 10.0.10.0/24
-    if ip_address(target_ip) not in subnet10:
+    # Containment as two int compares against the subnet bounds, instead of
+    # IPv4Network.__contains__ re-masking per check.
+    subnet10 = _net(vlan10["subnet"])  # e.g., 10.0.10.0/24
+    lo, hi = int(subnet10.network_address), int(subnet10.broadcast_address)
+    if not (lo <= int(_addr(target_ip)) <= hi):
         raise ValidationError(
             f"Controller target_ip {target_ip} must be within VLAN 10 subnet {subnet10}"
         )
@@ -311,11 +439,11 @@ def validate_controller_ip_migration(hardware: Dict[str, Any], vlans: Dict[str,
     if not gateway10:
         raise ValidationError("VLAN 10 gateway missing in vlans.yaml")
 
-    if ip_address(gateway10) not in subnet10:
+    if not (lo <= int(_addr(gateway10)) <= hi):
         raise ValidationError("VLAN 10 gateway must reside within VLAN 10 subnet")
 
 
-def validate_hardware_inventory(hardware: Dict[str, Any]) -> None:
+def validate_hardware_inventory(hardware: dict[str, Any]) -> None:
     """
     Validate hardware inventory completeness and flag missing configuration.
     
@@ -337,15 +465,15 @@ def validate_hardware_inventory(hardware: Dict[str, Any]) -> None:
         >>> validate_hardware_inventory(hw)  # Passes
     """
     hw = load_hardware_profile(hardware)
-    switches: List[Dict[str, Any]] = hw.get("switches", [])
-    errors: List[str] = []
+    errors: list[str] = []
 
-    for sw in switches:
+    for sw in hw["switches_by_model"].values():
         pa = sw.get("port_assignments", {})
         if isinstance(pa, dict):
+            # Single traversal per port: TBD and missing-MAC checks share one
+            # pass, with no intermediate serialization of the assignments.
             for port_num, cfg in pa.items():
-                text = str(cfg)
-                if "TBD" in text:
+                if _has_tbd(cfg):
                     errors.append(f"Switch {sw.get('model')} port {port_num} has TBD entries")
                 mac = cfg.get("mac")
                 device = cfg.get("device", "")
@@ -355,3 +483,61 @@ def validate_hardware_inventory(hardware: Dict[str, Any]) -> None:
 
     if errors:
         raise ValidationError("\n".join(errors))
+
+def canonical_blob(obj: Any) -> bytes:
+    """Serialize a parsed config dict to canonical JSON bytes for cache keying."""
+    return json.dumps(obj, sort_keys=True, default=str).encode()
+
+
+@functools.lru_cache(maxsize=32)
+def _validate_all(hardware_blob: bytes, vlans_blob: bytes, hardware_profile: str) -> Optional[str]:
+    """Run the full validator suite once per unique config pair.
+
+    Returns None on success or the ValidationError message on failure; the
+    caller re-raises so repeat runs over unchanged configs skip straight to
+    the cached verdict.
+    """
+    hardware = json.loads(hardware_blob)
+    vlans = json.loads(vlans_blob)
+    try:
+        validate_vlan_count(vlans, hardware_profile=hardware_profile)
+        vlan_ids = []
+        for key, vlan in vlans.items():
+            validate_vlan_schema(vlan)
+            vlan_ids.append(int(key))
+        validate_subnet_overlap(vlans)
+        validate_uplink_trunk_config(hardware, vlans, vlan_ids=vlan_ids)
+        validate_controller_ip_migration(hardware, vlans)
+    except ValidationError as e:
+        return str(e)
+    return None
+
+
+def validate_all_cached(
+    hardware_blob: bytes,
+    vlans_blob: bytes,
+    hardware_profile: str = "usg3p",
+) -> None:
+    """
+    Validate a full hardware + VLAN config pair with result memoization.
+
+    Callers pass canonical JSON bytes (see canonical_blob) so identical
+    configs hash to the same cache entry; tight plan/apply or watch loops
+    re-validating unchanged YAML pay only a dict lookup after the first run.
+
+    Args:
+        hardware_blob: canonical_blob(parsed hardware.yaml)
+        vlans_blob: canonical_blob(vlans section of vlans.yaml)
+        hardware_profile: Hardware identifier passed to validate_vlan_count
+
+    Raises:
+        ValidationError: The (possibly cached) failure for this config pair
+    """
+    error = _validate_all(hardware_blob, vlans_blob, hardware_profile)
+    if error is not None:
+        raise ValidationError(error)
+
+
+def invalidate() -> None:
+    """Drop all memoized validation verdicts (for tests and long-lived processes)."""
+    _validate_all.cache_clear()
@@ -0,0 +1,69 @@
+"""Tests for UniFiClient VLAN reconciliation."""
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from unifi_declarative.client import UniFiClient  # noqa: E402
+
+_VLANS = [
+    {"name": "Servers", "vlan_id": 10, "subnet": "10.0.1.0/26", "gateway": "10.0.1.1"},
+    {"name": "IoT", "vlan_id": 30, "subnet": "10.0.2.0/24", "gateway": "10.0.2.1"},
+    {"name": "Guest", "vlan_id": 40, "subnet": "10.0.3.0/24", "gateway": "10.0.3.1"},
+]
+
+
+def _client() -> UniFiClient:
+    return UniFiClient("https://unifi.example:8443", "admin", "secret", verify_ssl=False)
+
+
+def test_bulk_upsert_is_one_round_trip(monkeypatch):
+    client = _client()
+    posts = []
+    monkeypatch.setattr(client, "post", lambda path, payload: posts.append((path, payload)))
+
+    client.bulk_upsert_vlans(list(_VLANS))
+
+    assert len(posts) == 1
+    path, payload = posts[0]
+    assert path.endswith("/bulk")
+    assert len(payload["data"]) == len(_VLANS)
+
+
+def test_fallback_upserts_each_vlan_exactly_once(monkeypatch):
+    client = _client()
+    calls = []
+
+    def fake_post(path, payload):
+        if path.endswith("/bulk"):
+            raise RuntimeError("API error 404: no such endpoint")
+        calls.append(("post", path, payload))
+        return {}
+
+    def fake_put(path, payload):
+        calls.append(("put", path, payload))
+        return {}
+
+    monkeypatch.setattr(client, "post", fake_post)
+    monkeypatch.setattr(client, "put", fake_put)
+
+    # VLAN 10 already exists on the controller; 30 and 40 are new
+    networks = {"data": [{"_id": "abc123", "vlan": 10, "name": "Servers"}]}
+    client.bulk_upsert_vlans(list(_VLANS), networks=networks)
+
+    assert len(calls) == len(_VLANS)
+    methods = sorted(m for m, _, _ in calls)
+    assert methods == ["post", "post", "put"]
+    put_paths = [p for m, p, _ in calls if m == "put"]
+    assert put_paths == [f"{client._ep_networkconf}/abc123"]
+
+
+def test_bulk_upsert_noop_on_empty(monkeypatch):
+    client = _client()
+
+    def boom(path, payload):
+        raise AssertionError("no request expected for an empty VLAN list")
+
+    monkeypatch.setattr(client, "post", boom)
+    client.bulk_upsert_vlans([])
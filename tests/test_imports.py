@@ -0,0 +1,34 @@
+"""Package-wide import smoke test.
+
+Catches import-time breakage (bad names, syntax in rarely-exercised
+modules) while skipping modules whose optional third-party dependency is
+not installed. Only ModuleNotFoundError is skipped — a NameError or
+AttributeError at import time still fails the test.
+"""
+
+import importlib
+
+import pytest
+
+MODULES = [
+    "unifi_declarative",
+    "unifi_declarative._cache",
+    "unifi_declarative.apply",
+    "unifi_declarative.cli",
+    "unifi_declarative.client",
+    "unifi_declarative.client_async",
+    "unifi_declarative.differ",
+    "unifi_declarative.logging_config",
+    "unifi_declarative.models",
+    "unifi_declarative.parse",
+    "unifi_declarative.validate",
+    "unifi_declarative.validators",
+]
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_imports(name):
+    try:
+        importlib.import_module(name)
+    except ModuleNotFoundError as e:
+        pytest.skip(f"optional dependency not installed: {e.name}")
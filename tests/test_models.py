@@ -0,0 +1,30 @@
+"""Import and validation smoke tests for the pydantic models."""
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from unifi_declarative.models import VLAN_ADAPTER, VLANConfig  # noqa: E402
+
+_VALID_VLAN = {
+    "name": "Servers",
+    "purpose": "corporate",
+    "subnet": "10.0.1.0/26",
+    "gateway": "10.0.1.1",
+    "vlan_id": 10,
+    "dhcp_enabled": True,
+    "dhcp_start": "10.0.1.10",
+    "dhcp_stop": "10.0.1.62",
+}
+
+
+def test_adapter_validates_vlan():
+    vlan = VLAN_ADAPTER.validate_python(_VALID_VLAN)
+    assert isinstance(vlan, VLANConfig)
+    assert vlan.vlan_id == 10
+    assert vlan.enabled is True
+
+
+def test_gateway_outside_subnet_rejected():
+    with pytest.raises(Exception, match="not in"):
+        VLAN_ADAPTER.validate_python({**_VALID_VLAN, "gateway": "10.0.2.1"})